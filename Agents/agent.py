@@ -1,169 +1,410 @@
 import google.generativeai as gen_ai
 import os
 from dotenv import load_dotenv
+import asyncio
+import cachetools
+import hashlib
 import json
+import logging
+import re
+import sqlite3
+import threading
 import time
+import weakref
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from google.api_core import exceptions as google_exceptions
+from google.rpc import error_details_pb2
+from pydantic import BaseModel, ValidationError
+from utils.ratelimit import TokenBucket
+from utils.semcache import SemanticQuestionCache
+from utils.sqlite_cache import SQLiteCache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj, indent=False):
+        """Serialize to a JSON string, indented by two spaces if requested."""
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj, indent=False):
+        """Serialize to a JSON string, indented by two spaces if requested."""
+        return json.dumps(obj, indent=2 if indent else None)
 
 load_dotenv()
 
-class AnswerEvaluationAgent:
-    """
-    A class to evaluate interview answers using Google Gemini AI with comprehensive feedback.
-    """
+logger = logging.getLogger("ai_interview.agent")
+# Silent unless the application configures logging
+logger.addHandler(logging.NullHandler())
+
+# Extracts the server-advertised retry delay from a rate-limit error message,
+# for errors that do not carry a structured RetryInfo detail
+_RETRY_DELAY_RE = re.compile(r'seconds:\s*(\d+)')
+# Markdown code fences wrapped around JSON responses
+_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.MULTILINE)
+# A "questionN": "..." field whose closing quote has been received
+_QUESTION_FIELD_RE = re.compile(r'"(question\d+)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai_coach")
+_PREFERRED_MODEL_PATH = os.path.join(_CACHE_DIR, "preferred_model")
+_MODEL_CACHE_TTL = 24 * 60 * 60
+# In-process copy of list_models(), so rebuilt agents skip the network probe
+_MODEL_LIST_TTL = 60 * 60
+_model_list_cache = {"ts": 0.0, "models": None}
+_model_list_lock = threading.Lock()
+_RESPONSE_CACHE_PATH = os.path.join(_CACHE_DIR, "llm.sqlite3")
+_RESPONSE_CACHE_TTL = 24 * 60 * 60
+# Set GEMINI_DISABLE_CACHE=1 to always call the API, e.g. when tuning prompts
+_RESPONSE_CACHE_DISABLED = os.getenv("GEMINI_DISABLE_CACHE", "").lower() in ("1", "true", "yes")
+
+# Force selection of the best Gemini model
+_PREFERRED_MODELS = [
+    "models/gemini-1.5-flash",  # Use flash for better rate limits
+    "models/gemini-1.5-pro",
+    "models/gemini-1.5-pro-latest",
+]
+
+# Returned in place of a response when the API fails. The error marker makes
+# every caller fall back to its own default result for that response shape.
+_FALLBACK_RESPONSE_JSON = json.dumps({"error": "API request failed"})
+_FALLBACK_RESPONSE_JSON_BY_TYPE = {
+    error_type: json.dumps({"error": f"API request failed: {error_type}"})
+    for error_type in ("rate_limit", "api_error", "max_retries")
+}
+
+_FALLBACK_QUESTIONS = MappingProxyType({
+    "question1": "What is your experience with the technologies mentioned in your profile?",
+    "question2": "Can you explain a challenging problem you've solved recently?",
+    "question3": "How do you approach debugging and troubleshooting issues?",
+    "question4": "Describe your experience with version control and collaboration tools.",
+    "question5": "What are your preferred development methodologies and why?"
+})
+_FALLBACK_QUESTIONS_JSON = json.dumps(dict(_FALLBACK_QUESTIONS))
+
+# Default results used when a response is unusable. Callers get a fresh copy
+# parsed from the pre-serialized JSON, so nested values are never shared.
+_FALLBACK_EVALUATION = MappingProxyType({
+    "overall_score": 70,
+    "detailed_scores": {
+        "clarity": 14,
+        "completeness": 14,
+        "accuracy": 14,
+        "relevance": 14,
+        "communication": 14
+    },
+    "strengths": ["Shows understanding of the topic"],
+    "weaknesses": ["Could provide more specific details"],
+    "improvement_suggestions": ["Add concrete examples", "Structure answer more clearly"],
+    "detailed_feedback": "Unable to provide detailed evaluation due to API issues. The answer shows basic understanding but could benefit from more specific examples and clearer structure.",
+    "overall_impression": "Satisfactory",
+    "missing_elements": ["Specific examples", "Detailed explanations"],
+    "follow_up_questions": ["Can you provide a specific example?", "How would you handle edge cases?"]
+})
+_FALLBACK_EVALUATION_JSON = json.dumps(dict(_FALLBACK_EVALUATION))
+
+_FALLBACK_COMPREHENSIVE_EVALUATION = MappingProxyType({
+    "overall_score": 70,
+    "category_scores": {
+        "technical_knowledge": 14,
+        "problem_solving": 14,
+        "communication": 14,
+        "experience": 14,
+        "professionalism": 14
+    },
+    "strengths": ["Shows technical understanding"],
+    "areas_for_improvement": ["Provide more specific examples"],
+    "detailed_feedback": "Unable to provide detailed evaluation due to API issues. Consider providing more specific examples and structuring answers more clearly.",
+    "interview_readiness": "Needs Preparation",
+    "recommendations": ["Practice with specific examples", "Work on answer structure"]
+})
+_FALLBACK_COMPREHENSIVE_EVALUATION_JSON = json.dumps(dict(_FALLBACK_COMPREHENSIVE_EVALUATION))
+
+_FALLBACK_LEGACY_EVALUATION = MappingProxyType({
+    "overall_score": 70,
+    "category_scores": {
+        "technical_knowledge": 14,
+        "problem_solving": 14,
+        "communication": 14,
+        "experience": 14,
+        "best_practices": 14
+    },
+    "strengths": ["Shows technical understanding", "Communicates clearly"],
+    "areas_for_improvement": ["Could provide more specific examples", "Consider exploring advanced topics"],
+    "detailed_feedback": "The candidate demonstrates good foundational knowledge and communication skills. There's potential for growth with more practical experience."
+})
+_FALLBACK_LEGACY_EVALUATION_JSON = json.dumps(dict(_FALLBACK_LEGACY_EVALUATION))
+
+
+class QuestionSet(BaseModel):
+    """The five questions expected from question generation."""
+    question1: str
+    question2: str
+    question3: str
+    question4: str
+    question5: str
+
+
+class AnswerScores(BaseModel):
+    """Per-aspect scores of a single answer, each out of 20."""
+    clarity: int
+    completeness: int
+    accuracy: int
+    relevance: int
+    communication: int
+
+
+class AnswerEvaluation(BaseModel):
+    """The evaluation expected for a single answer."""
+    overall_score: int
+    detailed_scores: AnswerScores
+    strengths: list[str]
+    weaknesses: list[str]
+    improvement_suggestions: list[str]
+    detailed_feedback: str
+    overall_impression: str
+    missing_elements: list[str]
+    follow_up_questions: list[str]
+
+
+class CategoryScores(BaseModel):
+    """Per-category scores of an interview session, each out of 20."""
+    technical_knowledge: int
+    problem_solving: int
+    communication: int
+    experience: int
+    professionalism: int
+
+
+class IndividualScore(BaseModel):
+    """Score and short feedback for one answer within a session."""
+    question_number: int
+    score: int
+    feedback: str
+
+
+class SessionEvaluation(BaseModel):
+    """The evaluation expected for a complete interview session."""
+    overall_score: int
+    individual_scores: list[IndividualScore]
+    category_scores: CategoryScores
+    strengths: list[str]
+    areas_for_improvement: list[str]
+    consistency_analysis: str
+    detailed_feedback: str
+    interview_readiness: str
+    recommendations: list[str]
+    standout_moments: list[str]
+    red_flags: list[str]
+
+
+# Every prompt asks for JSON, so responses are requested in JSON mode. Shapes the
+# app renders directly are also constrained by a schema; parsing stays defensive
+# for cached responses, safety blocks and models without structured output.
+_JSON_GENERATION_CONFIG = gen_ai.GenerationConfig(response_mime_type="application/json")
+_QUESTION_SET_GENERATION_CONFIG = gen_ai.GenerationConfig(
+    response_mime_type="application/json", response_schema=QuestionSet
+)
+_ANSWER_EVALUATION_GENERATION_CONFIG = gen_ai.GenerationConfig(
+    response_mime_type="application/json", response_schema=AnswerEvaluation
+)
+_SESSION_EVALUATION_GENERATION_CONFIG = gen_ai.GenerationConfig(
+    response_mime_type="application/json", response_schema=SessionEvaluation
+)
+
+
+@dataclass(slots=True, frozen=True)
+class _TextResponse:
+    """Stand-in for a Gemini response, for cached and fallback results."""
+    text: str
+
+
+class _JSONObjectScanner:
+    """Find where the first top-level JSON object closes in text received piece by piece."""
+    __slots__ = ("depth", "in_string", "escaped", "start", "offset")
+
     def __init__(self):
-        """Initialize the agent with Google API key and model configuration."""
-        self.GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-        if not self.GOOGLE_API_KEY:
-            raise ValueError("GOOGLE_API_KEY not found in environment variables")
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.start = None
+        self.offset = 0
 
-        gen_ai.configure(api_key=self.GOOGLE_API_KEY)
+    def feed(self, chunk):
+        """Scan the next chunk; return the end offset of the object in the full text, or None."""
+        for i, char in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = self.start is not None
+            elif char == "{":
+                if self.start is None:
+                    self.start = self.offset + i
+                self.depth += 1
+            elif char == "}" and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.offset + i + 1
+        self.offset += len(chunk)
+        return None
 
-        try:
-            available_models = [m.name for m in gen_ai.list_models()]
-            print("🔍 Available Models:", available_models)
 
-            # Force selection of the best Gemini model
-            preferred_models = [
-                "models/gemini-1.5-flash",  # Use flash for better rate limits
-                "models/gemini-1.5-pro",  
-                "models/gemini-1.5-pro-latest",
-            ]
-            self.model_name = next((m for m in preferred_models if m in available_models), None)
+# Request pacing shared by every agent, since quotas apply to the whole API key.
+# GEMINI_QPM defaults to the gemini-1.5-flash free tier (15 requests/minute).
+_GEMINI_QPM = float(os.getenv("GEMINI_QPM", "15"))
+_GEMINI_MAX_CONCURRENT = int(os.getenv("GEMINI_MAX_CONCURRENT", "8"))
+_request_bucket = TokenBucket(rate=_GEMINI_QPM / 60.0, capacity=_GEMINI_QPM)
+# One semaphore per event loop, since asyncio primitives cannot cross loops
+_loop_semaphores = weakref.WeakKeyDictionary()
 
-            if not self.model_name:
-                raise ValueError("❌ No valid Gemini models found. Check your API key permissions.")
+# SDK configuration and models shared by every agent in the process
+_client_lock = threading.Lock()
+_configured_api_key = None
+_shared_models = {}
 
-            print(f"✅ Using Google Gemini Model: {self.model_name}")
-            self.model = gen_ai.GenerativeModel(self.model_name)
 
-        except Exception as e:
-            print(f"❌ Error loading models: {str(e)}")
-            self.model = None
+# SDK transport: "grpc" (default) or "grpc_asyncio" multiplex every request over
+# one HTTP/2 channel per client, "rest" keeps a pooled keep-alive HTTP session
+_GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT") or None
 
-    def _make_api_request_with_retry(self, prompt, max_retries=3):
-        """Make API request with exponential backoff retry logic."""
-        for attempt in range(max_retries):
+
+def _configure_client(api_key):
+    """Configure the Gemini SDK once per API key.
+
+    gen_ai.configure() discards the SDK's default clients, so calling it for
+    every agent would throw away their open connections. Configuring once
+    keeps a single persistent channel shared by all agents in the process.
+    """
+    global _configured_api_key
+    with _client_lock:
+        if _configured_api_key != api_key:
+            gen_ai.configure(api_key=api_key, transport=_GEMINI_TRANSPORT)
+            _configured_api_key = api_key
+            _shared_models.clear()
+
+
+_disk_cache_lock = threading.Lock()
+_disk_cache = None
+_disk_cache_unavailable = False
+
+
+def _get_disk_cache():
+    """Return the process-wide persistent response cache, or None if it cannot be opened."""
+    global _disk_cache, _disk_cache_unavailable
+    with _disk_cache_lock:
+        if _disk_cache is None and not _disk_cache_unavailable:
             try:
-                # Add random delay to avoid hitting rate limits
-                if attempt > 0:
-                    delay = (2 ** attempt) + random.uniform(0, 1)
-                    print(f"⏳ Waiting {delay:.1f} seconds before retry...")
-                    time.sleep(delay)
-                
-                response = self.model.generate_content(prompt)
-                return response
-                
-            except Exception as e:
-                error_msg = str(e)
-                print(f"❌ Attempt {attempt + 1} failed: {error_msg}")
-                
-                if "429" in error_msg or "quota" in error_msg.lower():
-                    if attempt < max_retries - 1:
-                        delay = 60  # Default 1 minute wait
-                        if "retry_delay" in error_msg:
-                            try:
-                                import re
-                                delay_match = re.search(r'seconds: (\d+)', error_msg)
-                                if delay_match:
-                                    delay = int(delay_match.group(1))
-                            except:
-                                pass
-                        
-                        print(f"⏳ Rate limit hit. Waiting {delay} seconds...")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        return self._get_fallback_response("rate_limit")
-                
-                elif attempt == max_retries - 1:
-                    return self._get_fallback_response("api_error")
-        
-        return self._get_fallback_response("max_retries")
+                _disk_cache = SQLiteCache(_RESPONSE_CACHE_PATH)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("⚠️ Persistent response cache disabled: %s", e)
+                _disk_cache_unavailable = True
+        return _disk_cache
 
-    def _get_fallback_response(self, error_type):
-        """Provide fallback responses when API fails."""
-        return type('Response', (), {
-            'text': json.dumps({
-                "overall_score": 70,
-                "detailed_scores": {
-                    "clarity": 14,
-                    "completeness": 14,
-                    "accuracy": 14,
-                    "relevance": 14,
-                    "communication": 14
-                },
-                "strengths": ["Answer provided shows understanding"],
-                "weaknesses": ["Could be more detailed"],
-                "improvement_suggestions": ["Provide specific examples", "Elaborate on key points"],
-                "detailed_feedback": "Unable to evaluate due to API issues. Please try again.",
-                "overall_impression": "Moderate"
-            })
-        })()
-
-    def evaluate_single_answer(self, question, answer, context=""):
-        """
-        Evaluate a single answer to an interview question.
-        
-        Args:
-            question (str): The interview question
-            answer (str): The candidate's answer
-            context (str): Additional context like job role, company, etc.
-        
-        Returns:
-            dict: Detailed evaluation results
-        """
-        prompt = self._create_answer_evaluation_prompt(question, answer, context)
-        
-        try:
-            response = self._make_api_request_with_retry(prompt)
-            result = self._extract_json_safe(response.text)
-            
-            if isinstance(result, dict) and not result.get("error"):
-                return result
-            else:
-                return self._get_fallback_evaluation()
-                
-        except Exception as e:
-            print(f"Error evaluating answer: {str(e)}")
-            return self._get_fallback_evaluation()
 
-    def evaluate_multiple_answers(self, qa_pairs, context=""):
-        """
-        Evaluate multiple question-answer pairs.
-        
-        Args:
-            qa_pairs (list): List of dictionaries with 'question' and 'answer' keys
-            context (str): Additional context
-            
-        Returns:
-            dict: Comprehensive evaluation results
-        """
-        prompt = self._create_multiple_answers_evaluation_prompt(qa_pairs, context)
-        
+def _get_request_semaphore():
+    """Return the semaphore bounding concurrent async requests on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _loop_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _loop_semaphores[loop] = asyncio.Semaphore(_GEMINI_MAX_CONCURRENT)
+    return semaphore
+
+
+def _get_shared_model(model_name):
+    """Return the process-wide GenerativeModel for a model name."""
+    with _client_lock:
+        model = _shared_models.get(model_name)
+        if model is None:
+            model = _shared_models[model_name] = gen_ai.GenerativeModel(model_name)
+        return model
+
+
+def _format_data(data):
+    """Render candidate or interview data for inclusion in a prompt."""
+    return _json_dumps(data, indent=True) if isinstance(data, dict) else str(data)
+
+
+def _read_cached_model_name():
+    """Return the model chosen during the last 24 hours, if any."""
+    try:
+        if time.time() - os.path.getmtime(_PREFERRED_MODEL_PATH) < _MODEL_CACHE_TTL:
+            with open(_PREFERRED_MODEL_PATH) as f:
+                return f.read().strip() or None
+    except OSError:
+        pass
+    return None
+
+
+def _list_model_names():
+    """Return the names of the available models, refreshed at most once per _MODEL_LIST_TTL."""
+    with _model_list_lock:
+        if _model_list_cache["models"] is None or time.time() - _model_list_cache["ts"] > _MODEL_LIST_TTL:
+            _model_list_cache["models"] = [m.name for m in gen_ai.list_models()]
+            _model_list_cache["ts"] = time.time()
+        return _model_list_cache["models"]
+
+
+def _select_model_name():
+    """Pick the Gemini model, calling list_models() only when nothing is pinned or cached.
+
+    The GEMINI_MODEL environment variable pins the model and skips discovery.
+    """
+    pinned_model = os.getenv("GEMINI_MODEL")
+    if pinned_model:
+        return pinned_model
+
+    cached_model = _read_cached_model_name()
+    if cached_model:
+        return cached_model
+
+    available_models = _list_model_names()
+    logger.debug("🔍 Available Models: %s", available_models)
+
+    model_name = next((m for m in _PREFERRED_MODELS if m in available_models), None)
+    if model_name:
         try:
-            response = self._make_api_request_with_retry(prompt)
-            result = self._extract_json_safe(response.text)
-            
-            if isinstance(result, dict) and not result.get("error"):
-                return result
-            else:
-                return self._get_fallback_comprehensive_evaluation()
-                
-        except Exception as e:
-            print(f"Error evaluating multiple answers: {str(e)}")
-            return self._get_fallback_comprehensive_evaluation()
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            with open(_PREFERRED_MODEL_PATH, "w") as f:
+                f.write(model_name)
+        except OSError as e:
+            logger.warning("⚠️ Could not cache model selection: %s", e)
+    return model_name
 
-    def _create_answer_evaluation_prompt(self, question, answer, context):
-        """Create a detailed prompt for evaluating a single answer."""
-        prompt = f"""
-You are an expert interview evaluator. Please evaluate the following interview answer comprehensively.
 
-Context: {context if context else "General interview evaluation"}
+@lru_cache(maxsize=1)
+def _get_model(api_key):
+    """Configure the SDK and select the model once per process.
 
-Question: {question}
+    Construction of further agents then costs no configuration or discovery.
+    Failures are not cached, so the next agent retries.
+
+    Returns:
+        tuple: (model_name, GenerativeModel)
+    """
+    _configure_client(api_key)
+    model_name = _select_model_name()
+    if not model_name:
+        raise ValueError("❌ No valid Gemini models found. Check your API key permissions.")
+
+    logger.info("✅ Using Google Gemini Model: %s", model_name)
+    return model_name, _get_shared_model(model_name)
 
-Answer: {answer}
+
+# Prompt templates, filled in with str.format(). Static instructions come
+# first and per-request data last, so requests share a common prefix.
+_ANSWER_PROMPT_TMPL = """
+You are an expert interview evaluator. Please evaluate the interview answer at the end of this prompt comprehensively.
 
 Please evaluate this answer and provide feedback in the following JSON format:
 
@@ -186,22 +427,16 @@ Please evaluate this answer and provide feedback in the following JSON format:
 }}
 
 Provide constructive, specific feedback that helps the candidate improve their interview performance.
-"""
-        return prompt
 
-    def _create_multiple_answers_evaluation_prompt(self, qa_pairs, context):
-        """Create a prompt for evaluating multiple answers comprehensively."""
-        qa_text = ""
-        for i, qa in enumerate(qa_pairs, 1):
-            qa_text += f"\nQ{i}: {qa['question']}\nA{i}: {qa['answer']}\n"
-        
-        prompt = f"""
-You are an expert interview evaluator. Please evaluate the following complete interview session comprehensively.
+Context: {context}
 
-Context: {context if context else "General interview evaluation"}
+Question: {question}
 
-Interview Questions and Answers:
-{qa_text}
+Answer: {answer}
+"""
+
+_MULTI_PROMPT_TMPL = """
+You are an expert interview evaluator. Please evaluate the complete interview session at the end of this prompt comprehensively.
 
 Please evaluate this interview session and provide feedback in the following JSON format:
 
@@ -233,38 +468,55 @@ Please evaluate this interview session and provide feedback in the following JSO
 }}
 
 Provide honest, constructive feedback that helps the candidate understand their performance and improve.
+
+Context: {context}
+
+Interview Questions and Answers:
+{qa_text}
 """
-        return prompt
 
-    def compare_answers(self, question, answer1, answer2, labels=["Answer A", "Answer B"]):
-        """
-        Compare two different answers to the same question.
-        
-        Args:
-            question (str): The interview question
-            answer1 (str): First answer to compare
-            answer2 (str): Second answer to compare
-            labels (list): Labels for the answers
-            
-        Returns:
-            dict: Comparison results
-        """
-        prompt = f"""
-You are an expert interview evaluator. Please compare these two answers to the same interview question.
+_SESSION_SUMMARY_PROMPT_TMPL = """
+You are an expert interview evaluator. Each answer of an interview session has already been evaluated individually. Combine those evaluations, listed at the end of this prompt, into an assessment of the whole session.
 
-Question: {question}
+Please provide the session assessment in the following JSON format:
+
+{{
+    "overall_score": [score out of 100],
+    "category_scores": {{
+        "technical_knowledge": [score out of 20],
+        "problem_solving": [score out of 20],
+        "communication": [score out of 20],
+        "experience": [score out of 20],
+        "professionalism": [score out of 20]
+    }},
+    "strengths": [list of overall strengths across all answers],
+    "areas_for_improvement": [list of areas needing improvement],
+    "consistency_analysis": "[analysis of consistency across answers]",
+    "detailed_feedback": "[comprehensive 3-4 paragraph feedback]",
+    "interview_readiness": "[Ready/Nearly Ready/Needs Preparation/Significant Preparation Needed]",
+    "recommendations": [list of specific recommendations for improvement],
+    "standout_moments": [list of particularly impressive aspects],
+    "red_flags": [list of concerning aspects, if any]
+}}
 
-{labels[0]}: {answer1}
+Provide honest, constructive feedback that helps the candidate understand their performance and improve.
+
+Context: {context}
+
+Individual Answer Evaluations:
+{evaluations_text}
+"""
 
-{labels[1]}: {answer2}
+_COMPARE_PROMPT_TMPL = """
+You are an expert interview evaluator. Please compare the two answers to the same interview question at the end of this prompt.
 
 Please provide a detailed comparison in the following JSON format:
 
 {{
     "comparison_summary": "[Overall summary of the comparison]",
     "scores": {{
-        "{labels[0].lower().replace(' ', '_')}": [score out of 100],
-        "{labels[1].lower().replace(' ', '_')}": [score out of 100]
+        "{key1}": [score out of 100],
+        "{key2}": [score out of 100]
     }},
     "detailed_comparison": {{
         "clarity": "[comparison of clarity]",
@@ -273,102 +525,27 @@ Please provide a detailed comparison in the following JSON format:
         "examples": "[comparison of examples used]",
         "structure": "[comparison of answer structure]"
     }},
-    "winner": "[{labels[0]}/{labels[1]}/Tie]",
+    "winner": "[{label1}/{label2}/Tie]",
     "reasoning": "[detailed reasoning for the winner]",
     "best_elements": {{
-        "{labels[0].lower().replace(' ', '_')}": [list of best elements from answer 1],
-        "{labels[1].lower().replace(' ', '_')}": [list of best elements from answer 2]
+        "{key1}": [list of best elements from answer 1],
+        "{key2}": [list of best elements from answer 2]
     }},
     "improvement_suggestions": {{
-        "{labels[0].lower().replace(' ', '_')}": [suggestions for answer 1],
-        "{labels[1].lower().replace(' ', '_')}": [suggestions for answer 2]
+        "{key1}": [suggestions for answer 1],
+        "{key2}": [suggestions for answer 2]
     }}
 }}
-"""
-        
-        try:
-            response = self._make_api_request_with_retry(prompt)
-            result = self._extract_json_safe(response.text)
-            
-            if isinstance(result, dict) and not result.get("error"):
-                return result
-            else:
-                return {"error": "Failed to compare answers"}
-                
-        except Exception as e:
-            print(f"Error comparing answers: {str(e)}")
-            return {"error": f"Comparison failed: {str(e)}"}
-
-    def _get_fallback_evaluation(self):
-        """Provide default evaluation when API fails."""
-        return {
-            "overall_score": 70,
-            "detailed_scores": {
-                "clarity": 14,
-                "completeness": 14,
-                "accuracy": 14,
-                "relevance": 14,
-                "communication": 14
-            },
-            "strengths": ["Shows understanding of the topic"],
-            "weaknesses": ["Could provide more specific details"],
-            "improvement_suggestions": ["Add concrete examples", "Structure answer more clearly"],
-            "detailed_feedback": "Unable to provide detailed evaluation due to API issues. The answer shows basic understanding but could benefit from more specific examples and clearer structure.",
-            "overall_impression": "Satisfactory",
-            "missing_elements": ["Specific examples", "Detailed explanations"],
-            "follow_up_questions": ["Can you provide a specific example?", "How would you handle edge cases?"]
-        }
 
-    def _get_fallback_comprehensive_evaluation(self):
-        """Provide default comprehensive evaluation when API fails."""
-        return {
-            "overall_score": 70,
-            "category_scores": {
-                "technical_knowledge": 14,
-                "problem_solving": 14,
-                "communication": 14,
-                "experience": 14,
-                "professionalism": 14
-            },
-            "strengths": ["Shows technical understanding"],
-            "areas_for_improvement": ["Provide more specific examples"],
-            "detailed_feedback": "Unable to provide detailed evaluation due to API issues. Consider providing more specific examples and structuring answers more clearly.",
-            "interview_readiness": "Needs Preparation",
-            "recommendations": ["Practice with specific examples", "Work on answer structure"]
-        }
+Question: {question}
 
-    def generate_questions(self, data):
-        """Generate technical interview questions (for backward compatibility)."""
-        if not self.model:
-            return json.dumps(self._get_fallback_questions())
-        
-        prompt = self._create_question_generation_prompt(data)
-        
-        try:
-            response = self._make_api_request_with_retry(prompt)
-            result = self._extract_json_safe(response.text)
-            
-            # Validate that we have the expected question format
-            if isinstance(result, dict) and not result.get("error"):
-                # Check if we have questions in the expected format
-                question_keys = [f"question{i}" for i in range(1, 6)]
-                if any(key in result for key in question_keys):
-                    return json.dumps(result)  # Return as JSON string
-                
-            # If validation fails, return fallback
-            return json.dumps(self._get_fallback_questions())
-            
-        except Exception as e:
-            print(f"Error generating questions: {str(e)}")
-            return json.dumps(self._get_fallback_questions())
+{label1}: {answer1}
 
-    def _create_question_generation_prompt(self, data):
-        """Create a prompt for generating interview questions based on user data."""
-        prompt = f"""
-You are an expert technical interviewer. Based on the following candidate information, generate 5 relevant technical interview questions.
+{label2}: {answer2}
+"""
 
-Candidate Information:
-{json.dumps(data, indent=2) if isinstance(data, dict) else str(data)}
+_QUESTION_PROMPT_TMPL = """
+You are an expert technical interviewer. Based on the candidate information at the end of this prompt, generate 5 relevant technical interview questions.
 
 Generate questions that are:
 1. Relevant to their experience level and technologies mentioned
@@ -387,47 +564,41 @@ Please provide exactly 5 questions in the following JSON format:
 }}
 
 Make sure the questions are specific, clear, and would help assess the candidate's technical competency.
+
+Candidate Information:
+{candidate_info}
 """
-        return prompt
 
-    def _get_fallback_questions(self):
-        """Provide default questions when API fails."""
-        return {
-            "question1": "What is your experience with the technologies mentioned in your profile?",
-            "question2": "Can you explain a challenging problem you've solved recently?",
-            "question3": "How do you approach debugging and troubleshooting issues?",
-            "question4": "Describe your experience with version control and collaboration tools.",
-            "question5": "What are your preferred development methodologies and why?"
-        }
+_BULK_QUESTION_PROMPT_TMPL = """
+You are an expert technical interviewer. For each candidate listed at the end of this prompt, generate 5 relevant technical interview questions.
 
-    def evaluate_candidate_agent(self, data):
-        """Evaluate the candidate's responses (for backward compatibility)."""
-        if not self.model:
-            return self._get_fallback_legacy_evaluation()
+Generate questions for each candidate that are:
+1. Relevant to their experience level and technologies mentioned
+2. Progressive in difficulty
+3. Mix of technical knowledge, problem-solving, and experience-based questions
+4. Appropriate for their stated role/position
 
-        prompt = self._create_legacy_evaluation_prompt(data)
+Please provide exactly 5 questions for every candidate in the following JSON format, with one entry per candidate:
 
-        try:
-            response = self._make_api_request_with_retry(prompt)
-            result = self._extract_json_safe(response.text)
-            
-            # If we get a valid result, return it
-            if isinstance(result, dict) and not result.get("error"):
-                return result
-            else:
-                return self._get_fallback_legacy_evaluation()
-                
-        except Exception as e:
-            print(f"Error evaluating candidate: {str(e)}")
-            return self._get_fallback_legacy_evaluation()
+{{
+    "candidate1": {{
+        "question1": "[First technical question]",
+        "question2": "[Second technical question]",
+        "question3": "[Third technical question]",
+        "question4": "[Fourth technical question]",
+        "question5": "[Fifth technical question]"
+    }},
+    "candidate2": {{ ... }}
+}}
 
-    def _create_legacy_evaluation_prompt(self, data):
-        """Create evaluation prompt for legacy compatibility."""
-        prompt = f"""
-You are an expert interview evaluator. Please evaluate the candidate's overall interview performance based on the following data:
+Make sure the questions are specific, clear, and would help assess each candidate's technical competency.
 
-Interview Data:
-{json.dumps(data, indent=2) if isinstance(data, dict) else str(data)}
+Candidates ({count} in total):
+{candidates_text}
+"""
+
+_LEGACY_PROMPT_TMPL = """
+You are an expert interview evaluator. Please evaluate the candidate's overall interview performance based on the interview data at the end of this prompt.
 
 Please provide evaluation in the following JSON format:
 
@@ -446,87 +617,1084 @@ Please provide evaluation in the following JSON format:
 }}
 
 Provide honest, constructive feedback that helps the candidate understand their performance.
+
+Interview Data:
+{interview_data}
 """
-        return prompt
 
-    def _get_fallback_legacy_evaluation(self):
-        """Provide default evaluation for legacy compatibility."""
-        return {
-            "overall_score": 70,
-            "category_scores": {
-                "technical_knowledge": 14,
-                "problem_solving": 14,
-                "communication": 14,
-                "experience": 14,
-                "best_practices": 14
-            },
-            "strengths": ["Shows technical understanding", "Communicates clearly"],
-            "areas_for_improvement": ["Could provide more specific examples", "Consider exploring advanced topics"],
-            "detailed_feedback": "The candidate demonstrates good foundational knowledge and communication skills. There's potential for growth with more practical experience."
-        }
 
-    def _extract_json_safe(self, response_text):
-        """Safely extract JSON content from the model's response."""
+class AnswerEvaluationAgent:
+    """
+    A class to evaluate interview answers using Google Gemini AI with comprehensive feedback.
+    """
+    # Largest number of candidates packed into one bulk question prompt
+    MAX_BULK_CANDIDATES = 8
+    # Largest number of question-answer pairs evaluated in one session prompt
+    BATCH_THRESHOLD = 8
+    # Answers shorter than this (after stripping) are scored locally, without an API call
+    MIN_ANSWER_LENGTH = 10
+    # Retry backoff bounds in seconds (Full Jitter: uniform(0, min(cap, base * 2**attempt)))
+    BACKOFF_BASE = 1.0
+    BACKOFF_CAP = 60.0
+    # Use decorrelated jitter (uniform(base, 3 * previous delay)) instead of Full Jitter
+    DECORRELATED_JITTER = False
+    # Longest wait honored after a rate-limit error before retrying
+    MAX_BACKOFF_S = 30.0
+
+    def __init__(self):
+        """Initialize the agent with Google API key and model configuration."""
+        self.GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
+        if not self.GOOGLE_API_KEY:
+            raise ValueError("GOOGLE_API_KEY not found in environment variables")
+
+        # Exact-match cache of response texts keyed by (model_name, prompt)
+        self._cache = cachetools.TTLCache(maxsize=1024, ttl=3600)
+        self._cache_lock = threading.Lock()
+        self._cache_stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        # Second tier that survives restarts and is shared between processes
+        self._disk_cache = _get_disk_cache()
+        # Question sets reused across candidates with near-identical profiles
+        self._question_cache = SemanticQuestionCache()
+        # Last backoff delay, the input to decorrelated jitter
+        self._last_delay = self.BACKOFF_BASE
+        # Requests in progress by cache key, joined by identical concurrent prompts
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._inflight_async = {}
+
+        try:
+            self.model_name, self.model = _get_model(self.GOOGLE_API_KEY)
+
+        except Exception as e:
+            logger.error("❌ Error loading models: %s", e)
+            self.model_name = None
+            self.model = None
+
+    def _cache_key(self, prompt):
+        """Build the response cache key for a prompt on the current model."""
+        return hashlib.blake2b(f"{self.model_name}|{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def _get_cached_response(self, cache_key):
+        """Return a response object for a cached prompt, or None on a miss.
+
+        The in-memory cache is checked first, then the persistent cache,
+        whose hits are copied into memory.
+        """
+        with self._cache_lock:
+            cached_text = self._cache.get(cache_key)
+            if cached_text is not None:
+                self._cache_stats["hits"] += 1
+                return _TextResponse(cached_text)
+
+        cached_text = None
+        if self._disk_cache is not None:
+            try:
+                cached_text = self._disk_cache.get(cache_key)
+            except sqlite3.Error as e:
+                logger.warning("⚠️ Persistent cache read failed: %s", e)
+
+        with self._cache_lock:
+            if cached_text is None:
+                self._cache_stats["misses"] += 1
+                return None
+            self._cache[cache_key] = cached_text
+            self._cache_stats["hits"] += 1
+            self._cache_stats["disk_hits"] += 1
+        return _TextResponse(cached_text)
+
+    def _store_response(self, cache_key, response):
+        """Cache the text of a successful API response in memory and on disk."""
         try:
-            # Handle potential markdown formatting
-            if response_text.startswith("```") and "```" in response_text:
-                lines = response_text.split('\n')
-                json_lines = []
-                in_json = False
+            response_text = response.text
+        except ValueError:
+            # Blocked or empty candidates; nothing worth caching
+            return
+
+        with self._cache_lock:
+            self._cache[cache_key] = response_text
+
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(cache_key, response_text, expire=_RESPONSE_CACHE_TTL)
+            except sqlite3.Error as e:
+                logger.warning("⚠️ Persistent cache write failed: %s", e)
+
+    def _backoff_delay(self, attempt, upper=None):
+        """Pick a jittered backoff delay for an attempt.
+
+        ``upper`` raises the exponential bound, e.g. to a server-advertised
+        retry delay; the result never exceeds BACKOFF_CAP.
+        """
+        if self.DECORRELATED_JITTER:
+            delay = random.uniform(self.BACKOFF_BASE, max(self.BACKOFF_BASE, self._last_delay * 3))
+            if upper is not None:
+                delay = max(delay, random.uniform(0, upper))
+        else:
+            bound = self.BACKOFF_BASE * (2 ** attempt)
+            if upper is not None:
+                bound = max(bound, upper)
+            delay = random.uniform(0, bound)
+
+        delay = min(self.BACKOFF_CAP, delay)
+        self._last_delay = delay
+        return delay
+
+    def _server_retry_delay(self, error):
+        """Return the retry delay in seconds advertised with a rate-limit error, or None."""
+        if isinstance(error, google_exceptions.GoogleAPICallError):
+            for detail in error.details or ():
+                if isinstance(detail, error_details_pb2.RetryInfo):
+                    return detail.retry_delay.seconds + detail.retry_delay.nanos / 1e9
+
+        error_msg = str(error)
+        delay_match = _RETRY_DELAY_RE.search(error_msg) if "retry_delay" in error_msg else None
+        return int(delay_match.group(1)) if delay_match else None
+
+    def _rate_limit_delay(self, error, attempt):
+        """
+        Seconds to wait after a rate-limit error.
+
+        A server-advertised delay is waited out in full, up to MAX_BACKOFF_S,
+        plus up to 10% jitter so rejected callers do not retry in lockstep.
+        Without one, a jittered backoff bounded by MAX_BACKOFF_S is used.
+        """
+        server_delay = self._server_retry_delay(error)
+        if server_delay is None:
+            return self._backoff_delay(attempt, upper=self.MAX_BACKOFF_S)
+
+        delay = min(server_delay, self.MAX_BACKOFF_S)
+        return delay + random.uniform(0, delay * 0.1)
+
+    def _is_rate_limit_error(self, error):
+        """Whether an API error means the quota or rate limit was exceeded."""
+        if isinstance(error, google_exceptions.ResourceExhausted):
+            return True
+        error_msg = str(error)
+        return "429" in error_msg or "quota" in error_msg.lower()
+
+    def _make_api_request_with_retry(self, prompt, max_retries=3, use_cache=True,
+                                     generation_config=_JSON_GENERATION_CONFIG):
+        """Make API request with exponential backoff retry logic.
+
+        Identical prompts are served from the response cache without
+        contacting the API, unless ``use_cache`` is False or caching is
+        disabled through GEMINI_DISABLE_CACHE. Concurrent identical prompts
+        share a single request. A prompt is always sent with the same
+        ``generation_config``, so the prompt alone keys the cache.
+        """
+        use_cache = use_cache and not _RESPONSE_CACHE_DISABLED
+        cache_key = self._cache_key(prompt)
+        if use_cache:
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                return cached_response
+
+            # Wait for an identical request already in progress instead of repeating it
+            with self._inflight_lock:
+                future = self._inflight.get(cache_key)
+                is_owner = future is None
+                if is_owner:
+                    future = self._inflight[cache_key] = Future()
+            if not is_owner:
+                return future.result()
+
+            try:
+                response = self._request_with_retry(prompt, cache_key, max_retries, use_cache, generation_config)
+                future.set_result(response)
+                return response
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(cache_key, None)
+
+        return self._request_with_retry(prompt, cache_key, max_retries, use_cache, generation_config)
+
+    def _request_with_retry(self, prompt, cache_key, max_retries, use_cache, generation_config):
+        """Call the API, retrying with backoff, and cache the successful response."""
+        rate_limited = False
+        for attempt in range(max_retries):
+            try:
+                # Add random delay to avoid hitting rate limits; a rate-limit
+                # wait has already been served by the except branch
+                if attempt > 0 and not rate_limited:
+                    delay = self._backoff_delay(attempt)
+                    logger.info("⏳ Waiting %.1f seconds before retry...", delay)
+                    time.sleep(delay)
+                rate_limited = False
+                
+                _request_bucket.acquire()
+                response = self.model.generate_content(prompt, generation_config=generation_config)
+                if use_cache:
+                    self._store_response(cache_key, response)
+                return response
                 
-                for line in lines:
-                    if line.strip().startswith("```"):
-                        in_json = not in_json
+            except Exception as e:
+                error_msg = str(e)
+                logger.warning("❌ Attempt %d failed: %s", attempt + 1, error_msg)
+                
+                if self._is_rate_limit_error(e):
+                    # Slow down every caller sharing the quota, not just this one
+                    _request_bucket.drain()
+                    if attempt < max_retries - 1:
+                        delay = self._rate_limit_delay(e, attempt)
+                        rate_limited = True
+                        logger.warning("⏳ Rate limit hit. Waiting %.1f seconds...", delay)
+                        time.sleep(delay)
                         continue
-                    if in_json:
-                        json_lines.append(line)
+                    else:
+                        return self._get_fallback_response("rate_limit")
                 
-                response_text = '\n'.join(json_lines)
+                elif attempt == max_retries - 1:
+                    return self._get_fallback_response("api_error")
+        
+        return self._get_fallback_response("max_retries")
+
+    async def _make_api_request_with_retry_async(self, prompt, max_retries=3, use_cache=True,
+                                                 generation_config=_JSON_GENERATION_CONFIG):
+        """Async variant of _make_api_request_with_retry.
+
+        Waits without blocking the event loop, and bounds the number of
+        concurrent requests to GEMINI_MAX_CONCURRENT.
+        """
+        use_cache = use_cache and not _RESPONSE_CACHE_DISABLED
+        cache_key = self._cache_key(prompt)
+        if use_cache:
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                return cached_response
+
+            # Join an identical request already in progress on this event loop
+            loop = asyncio.get_running_loop()
+            future = self._inflight_async.get(cache_key)
+            if future is not None and future.get_loop() is loop:
+                # Shielded, so a cancelled waiter does not cancel the shared request
+                return await asyncio.shield(future)
+
+            future = self._inflight_async[cache_key] = loop.create_future()
+            try:
+                response = await self._arequest_with_retry(prompt, cache_key, max_retries, use_cache, generation_config)
+                future.set_result(response)
+                return response
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                if self._inflight_async.get(cache_key) is future:
+                    del self._inflight_async[cache_key]
+
+        return await self._arequest_with_retry(prompt, cache_key, max_retries, use_cache, generation_config)
+
+    async def _arequest_with_retry(self, prompt, cache_key, max_retries, use_cache, generation_config):
+        """Async variant of _request_with_retry."""
+        rate_limited = False
+        for attempt in range(max_retries):
+            try:
+                # Add random delay to avoid hitting rate limits; a rate-limit
+                # wait has already been served by the except branch
+                if attempt > 0 and not rate_limited:
+                    delay = self._backoff_delay(attempt)
+                    logger.info("⏳ Waiting %.1f seconds before retry...", delay)
+                    await asyncio.sleep(delay)
+                rate_limited = False
+
+                async with _get_request_semaphore():
+                    await _request_bucket.aacquire()
+                    response = await self.model.generate_content_async(prompt, generation_config=generation_config)
+                if use_cache:
+                    self._store_response(cache_key, response)
+                return response
+
+            except Exception as e:
+                error_msg = str(e)
+                logger.warning("❌ Attempt %d failed: %s", attempt + 1, error_msg)
+
+                if self._is_rate_limit_error(e):
+                    # Slow down every caller sharing the quota, not just this one
+                    _request_bucket.drain()
+                    if attempt < max_retries - 1:
+                        delay = self._rate_limit_delay(e, attempt)
+                        rate_limited = True
+                        logger.warning("⏳ Rate limit hit. Waiting %.1f seconds...", delay)
+                        await asyncio.sleep(delay)
+                        continue
+                    else:
+                        return self._get_fallback_response("rate_limit")
+
+                elif attempt == max_retries - 1:
+                    return self._get_fallback_response("api_error")
+
+        return self._get_fallback_response("max_retries")
+
+    async def _stream_and_parse(self, prompt, use_cache=True, generation_config=_JSON_GENERATION_CONFIG):
+        """
+        Stream a response and parse its JSON object as soon as the object closes.
+
+        The stream is abandoned once the top-level braces balance, so trailing
+        text is never waited for. Falls back to _make_api_request_with_retry_async
+        if streaming fails or the streamed text does not parse.
+
+        Returns:
+            dict: The parsed JSON object, or an error dict
+        """
+        use_cache = use_cache and not _RESPONSE_CACHE_DISABLED
+        cache_key = self._cache_key(prompt)
+        if use_cache:
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                return self._extract_json_safe(cached_response.text)
+
+        chunks = []
+        scanner = _JSONObjectScanner()
+        end = None
+        try:
+            async with _get_request_semaphore():
+                await _request_bucket.aacquire()
+                response = await self.model.generate_content_async(
+                    prompt, generation_config=generation_config, stream=True
+                )
+                async for chunk in response:
+                    chunks.append(chunk.text)
+                    end = scanner.feed(chunk.text)
+                    if end is not None:
+                        break
+        except Exception as e:
+            logger.warning("⚠️ Streaming request failed, retrying without streaming: %s", e)
+            end = None
+
+        if end is not None:
+            json_text = "".join(chunks)[scanner.start:end]
+            try:
+                result = _json_loads(json_text)
+            except ValueError:
+                result = None
+            if isinstance(result, dict):
+                if use_cache:
+                    self._store_response(cache_key, _TextResponse(json_text))
+                return result
+
+        response = await self._make_api_request_with_retry_async(
+            prompt, use_cache=use_cache, generation_config=generation_config
+        )
+        return self._extract_json_safe(response.text)
+
+    def _run_and_parse(self, prompt, fallback_fn, validator=None, use_cache=True,
+                       generation_config=_JSON_GENERATION_CONFIG):
+        """
+        Request a JSON response and parse it, or return ``fallback_fn()``.
+
+        Error dicts, non-object responses and results rejected by
+        ``validator`` all count as failures.
+        """
+        try:
+            response = self._make_api_request_with_retry(
+                prompt, use_cache=use_cache, generation_config=generation_config
+            )
+            result = self._extract_json_safe(response.text)
+            if isinstance(result, dict) and not result.get("error") and (validator is None or validator(result)):
+                return result
+        except Exception:
+            logger.exception("Error processing API response")
+        return fallback_fn()
+
+    async def _arun_and_parse(self, prompt, fallback_fn, validator=None, use_cache=True, stream=False,
+                              generation_config=_JSON_GENERATION_CONFIG):
+        """Async variant of _run_and_parse; ``stream`` parses via _stream_and_parse."""
+        try:
+            if stream:
+                result = await self._stream_and_parse(
+                    prompt, use_cache=use_cache, generation_config=generation_config
+                )
+            else:
+                response = await self._make_api_request_with_retry_async(
+                    prompt, use_cache=use_cache, generation_config=generation_config
+                )
+                result = self._extract_json_safe(response.text)
+            if isinstance(result, dict) and not result.get("error") and (validator is None or validator(result)):
+                return result
+        except Exception:
+            logger.exception("Error processing API response")
+        return fallback_fn()
+
+    def _get_fallback_response(self, error_type):
+        """Provide fallback responses when API fails."""
+        return _TextResponse(_FALLBACK_RESPONSE_JSON_BY_TYPE.get(error_type, _FALLBACK_RESPONSE_JSON))
+
+    def evaluate_single_answer(self, question, answer, context="", use_cache=True):
+        """
+        Evaluate a single answer to an interview question.
+        
+        Args:
+            question (str): The interview question
+            answer (str): The candidate's answer
+            context (str): Additional context like job role, company, etc.
+            use_cache (bool): Reuse a cached evaluation of an identical prompt
+        
+        Returns:
+            dict: Detailed evaluation results
+        """
+        trivial_result = self._trivial_answer_evaluation(question, answer)
+        if trivial_result is not None:
+            return trivial_result
+
+        prompt = self._create_answer_evaluation_prompt(question, answer, context)
+        return self._run_and_parse(
+            prompt, self._get_fallback_evaluation, use_cache=use_cache,
+            generation_config=_ANSWER_EVALUATION_GENERATION_CONFIG,
+        )
+
+    def evaluate_multiple_answers(self, qa_pairs, context="", max_pairs_per_call=None):
+        """
+        Evaluate multiple question-answer pairs.
+
+        Up to ``max_pairs_per_call`` pairs share a single prompt. Longer sessions
+        are split into chunks of that size, evaluated concurrently and merged.
+        
+        Args:
+            qa_pairs (list): List of dictionaries with 'question' and 'answer' keys
+            context (str): Additional context
+            max_pairs_per_call (int): Pairs per API call, BATCH_THRESHOLD by default
             
-            # Find JSON object boundaries
-            start_idx = response_text.find("{")
-            end_idx = response_text.rfind("}") + 1
+        Returns:
+            dict: Comprehensive evaluation results
+        """
+        chunk_size = max_pairs_per_call or self.BATCH_THRESHOLD
+        if len(qa_pairs) <= chunk_size:
+            return self._evaluate_answers_chunk(qa_pairs, context)
+
+        chunks = [qa_pairs[i:i + chunk_size] for i in range(0, len(qa_pairs), chunk_size)]
+        with ThreadPoolExecutor(max_workers=min(len(chunks), _GEMINI_MAX_CONCURRENT)) as executor:
+            results = list(executor.map(lambda chunk: self._evaluate_answers_chunk(chunk, context), chunks))
+        return self._merge_chunk_evaluations(chunks, results)
+
+    def _evaluate_answers_chunk(self, qa_pairs, context):
+        """Evaluate question-answer pairs with a single session prompt."""
+        prompt = self._create_multiple_answers_evaluation_prompt(qa_pairs, context)
+        return self._run_and_parse(
+            prompt, self._get_fallback_comprehensive_evaluation,
+            generation_config=_SESSION_EVALUATION_GENERATION_CONFIG,
+        )
+
+    def evaluate_multiple_answers_stream(self, qa_pairs, context=""):
+        """
+        Stream the session evaluation response as it is produced.
+
+        Yields text chunks of the model's JSON output. A valid complete response
+        is cached once the stream ends, so a following
+        evaluate_multiple_answers(qa_pairs, context) call returns the parsed
+        evaluation immediately. Sessions longer than BATCH_THRESHOLD are
+        evaluated in chunks and yielded as a single merged JSON document.
+        """
+        if not self.model:
+            yield _FALLBACK_COMPREHENSIVE_EVALUATION_JSON
+            return
+
+        if len(qa_pairs) > self.BATCH_THRESHOLD:
+            yield _json_dumps(self.evaluate_multiple_answers(qa_pairs, context))
+            return
+
+        use_cache = not _RESPONSE_CACHE_DISABLED
+        prompt = self._create_multiple_answers_evaluation_prompt(qa_pairs, context)
+        cache_key = self._cache_key(prompt)
+        if use_cache:
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                yield cached_response.text
+                return
+
+        chunks = []
+        try:
+            _request_bucket.acquire()
+            for chunk in self.model.generate_content(
+                prompt, generation_config=_SESSION_EVALUATION_GENERATION_CONFIG, stream=True
+            ):
+                chunks.append(chunk.text)
+                yield chunk.text
+        except Exception:
+            logger.exception("Error streaming session evaluation")
+            if not chunks:
+                yield _FALLBACK_COMPREHENSIVE_EVALUATION_JSON
+            return
+
+        response = _TextResponse("".join(chunks))
+        if use_cache and self.parse_session_evaluation(response.text) is not None:
+            self._store_response(cache_key, response)
+
+    def parse_session_evaluation(self, text):
+        """Parse streamed session evaluation text, or return None if it is not a usable result."""
+        result = self._extract_json_safe(text)
+        if isinstance(result, dict) and not result.get("error"):
+            return result
+        return None
+
+    def _merge_chunk_evaluations(self, chunks, results):
+        """
+        Combine the session evaluations of consecutive chunks into one report.
+
+        Scores are averaged weighted by chunk size, individual scores are
+        renumbered across the whole session, and list fields are concatenated
+        without duplicates.
+        """
+        total_pairs = sum(len(chunk) for chunk in chunks)
+        merged = {"individual_scores": []}
+        category_totals = {}
+        list_fields = ("strengths", "areas_for_improvement", "recommendations", "standout_moments", "red_flags")
+        merged_lists = {field: [] for field in list_fields}
+        text_fields = {"consistency_analysis": [], "detailed_feedback": []}
+        readiness_levels = ["Ready", "Nearly Ready", "Needs Preparation", "Significant Preparation Needed"]
+        readiness = None
+        overall_total = 0
+        offset = 0
+
+        for chunk, result in zip(chunks, results):
+            weight = len(chunk)
+            overall_total += result.get("overall_score", 0) * weight
+
+            for item in result.get("individual_scores", []):
+                item = dict(item)
+                item["question_number"] = item.get("question_number", 0) + offset
+                merged["individual_scores"].append(item)
+            offset += weight
+
+            for category, score in result.get("category_scores", {}).items():
+                category_totals[category] = category_totals.get(category, 0) + score * weight
+
+            for field in list_fields:
+                for value in result.get(field, []):
+                    if value not in merged_lists[field]:
+                        merged_lists[field].append(value)
+
+            for field, parts in text_fields.items():
+                if result.get(field):
+                    parts.append(result[field])
+
+            # Report the least ready verdict across chunks
+            level = result.get("interview_readiness")
+            if level in readiness_levels and (
+                readiness is None or readiness_levels.index(level) > readiness_levels.index(readiness)
+            ):
+                readiness = level
+
+        merged["overall_score"] = round(overall_total / total_pairs)
+        merged["category_scores"] = {
+            category: round(total / total_pairs) for category, total in category_totals.items()
+        }
+        merged.update(merged_lists)
+        merged.update({field: "\n\n".join(parts) for field, parts in text_fields.items()})
+        merged["interview_readiness"] = readiness or "Needs Preparation"
+        return merged
+
+    async def aevaluate_single_answer(self, question, answer, context="", use_cache=True):
+        """Async variant of evaluate_single_answer."""
+        trivial_result = self._trivial_answer_evaluation(question, answer)
+        if trivial_result is not None:
+            return trivial_result
+
+        prompt = self._create_answer_evaluation_prompt(question, answer, context)
+        return await self._arun_and_parse(
+            prompt, self._get_fallback_evaluation, use_cache=use_cache,
+            generation_config=_ANSWER_EVALUATION_GENERATION_CONFIG,
+        )
+
+    async def aevaluate_multiple_answers(self, qa_pairs, context=""):
+        """
+        Evaluate multiple question-answer pairs concurrently (map-reduce).
+
+        Every answer is evaluated on its own with aevaluate_single_answer, all at
+        once, and a single summary call then combines those evaluations into the
+        session-level report returned by evaluate_multiple_answers.
+
+        Args:
+            qa_pairs (list): List of dictionaries with 'question' and 'answer' keys
+            context (str): Additional context
+
+        Returns:
+            dict: Comprehensive evaluation results
+        """
+        evaluations = await asyncio.gather(
+            *[self.aevaluate_single_answer(qa['question'], qa['answer'], context) for qa in qa_pairs],
+            return_exceptions=True,
+        )
+        evaluations = [
+            evaluation if isinstance(evaluation, dict) else self._get_fallback_evaluation()
+            for evaluation in evaluations
+        ]
+        individual_scores = [
+            {
+                "question_number": i,
+                "score": evaluation.get("overall_score", 0),
+                "feedback": evaluation.get("detailed_feedback", ""),
+            }
+            for i, evaluation in enumerate(evaluations, 1)
+        ]
+
+        prompt = self._create_session_summary_prompt(qa_pairs, evaluations, context)
+        result = await self._arun_and_parse(prompt, lambda: None, stream=True)
+        if result is not None:
+            result["individual_scores"] = individual_scores
+            return result
+
+        result = self._get_fallback_comprehensive_evaluation()
+        result["individual_scores"] = individual_scores
+        if individual_scores:
+            result["overall_score"] = round(
+                sum(item["score"] for item in individual_scores) / len(individual_scores)
+            )
+        return result
+
+    def _create_answer_evaluation_prompt(self, question, answer, context):
+        """Create a detailed prompt for evaluating a single answer."""
+        return _ANSWER_PROMPT_TMPL.format(
+            question=question, answer=answer, context=context or "General interview evaluation"
+        )
+
+    def _create_multiple_answers_evaluation_prompt(self, qa_pairs, context):
+        """Create a prompt for evaluating multiple answers comprehensively."""
+        qa_text = "".join(
+            f"\nQ{i}: {qa['question']}\nA{i}: {qa['answer']}\n" for i, qa in enumerate(qa_pairs, 1)
+        )
+
+        return _MULTI_PROMPT_TMPL.format(qa_text=qa_text, context=context or "General interview evaluation")
+
+    def _create_session_summary_prompt(self, qa_pairs, evaluations, context):
+        """Create a prompt that combines per-answer evaluations into a session report."""
+        evaluations_text = "\n".join(
+            f"\nQ{i}: {qa['question']}\n"
+            f"Score: {evaluation.get('overall_score', 'N/A')}/100 "
+            f"({evaluation.get('overall_impression', 'N/A')})\n"
+            f"Strengths: {'; '.join(evaluation.get('strengths', []))}\n"
+            f"Weaknesses: {'; '.join(evaluation.get('weaknesses', []))}"
+            for i, (qa, evaluation) in enumerate(zip(qa_pairs, evaluations), 1)
+        )
+
+        return _SESSION_SUMMARY_PROMPT_TMPL.format(
+            evaluations_text=evaluations_text, context=context or "General interview evaluation"
+        )
+
+    def compare_answers(self, question, answer1, answer2, labels=["Answer A", "Answer B"]):
+        """
+        Compare two different answers to the same question.
+        
+        Args:
+            question (str): The interview question
+            answer1 (str): First answer to compare
+            answer2 (str): Second answer to compare
+            labels (list): Labels for the answers
             
-            if start_idx >= 0 and end_idx > start_idx:
-                response_text = response_text[start_idx:end_idx]
+        Returns:
+            dict: Comparison results
+        """
+        prompt = self._create_comparison_prompt(question, answer1, answer2, labels)
+        return self._run_and_parse(prompt, self._get_failed_comparison)
 
-            return json.loads(response_text)
+    async def acompare_answers(self, question, answer1, answer2, labels=["Answer A", "Answer B"]):
+        """Async variant of compare_answers."""
+        prompt = self._create_comparison_prompt(question, answer1, answer2, labels)
+        return await self._arun_and_parse(prompt, self._get_failed_comparison, stream=True)
+
+    async def acompare_answers_many(self, comparisons):
+        """
+        Run several answer comparisons concurrently.
+
+        Args:
+            comparisons (list): Dictionaries with 'question', 'answer1' and 'answer2'
+                keys, plus optional 'labels'
+
+        Returns:
+            list: Comparison results, in the same order as comparisons
+        """
+        return list(await asyncio.gather(*[
+            self.acompare_answers(
+                c['question'], c['answer1'], c['answer2'], c.get('labels', ["Answer A", "Answer B"])
+            )
+            for c in comparisons
+        ]))
+
+    def _create_comparison_prompt(self, question, answer1, answer2, labels):
+        """Create a prompt comparing two answers to the same question."""
+        return _COMPARE_PROMPT_TMPL.format(
+            question=question,
+            answer1=answer1,
+            answer2=answer2,
+            label1=labels[0],
+            label2=labels[1],
+            key1=labels[0].lower().replace(' ', '_'),
+            key2=labels[1].lower().replace(' ', '_'),
+        )
+
+    def _get_failed_comparison(self):
+        """Error result returned when a comparison cannot be produced."""
+        return {"error": "Failed to compare answers"}
+
+    def _trivial_answer_evaluation(self, question, answer):
+        """Score empty, very short or question-repeating answers locally, or return None."""
+        stripped_answer = (answer or "").strip()
+        if len(stripped_answer) >= self.MIN_ANSWER_LENGTH and stripped_answer.lower() != (question or "").strip().lower():
+            return None
+
+        if not stripped_answer:
+            feedback = "No answer was provided."
+        elif len(stripped_answer) < self.MIN_ANSWER_LENGTH:
+            feedback = "Answer too short to evaluate."
+        else:
+            feedback = "The answer only repeats the question."
+
+        return {
+            "overall_score": 10,
+            "detailed_scores": {
+                "clarity": 2,
+                "completeness": 2,
+                "accuracy": 2,
+                "relevance": 2,
+                "communication": 2
+            },
+            "strengths": [],
+            "weaknesses": ["The answer does not address the question"],
+            "improvement_suggestions": ["Answer the question directly", "Explain your reasoning with a concrete example"],
+            "detailed_feedback": feedback,
+            "overall_impression": "Poor",
+            "missing_elements": ["A substantive answer"],
+            "follow_up_questions": []
+        }
+
+    def _get_fallback_evaluation(self):
+        """Provide default evaluation when API fails."""
+        return _json_loads(_FALLBACK_EVALUATION_JSON)
+
+    def _get_fallback_comprehensive_evaluation(self):
+        """Provide default comprehensive evaluation when API fails."""
+        return _json_loads(_FALLBACK_COMPREHENSIVE_EVALUATION_JSON)
+
+    def generate_questions(self, data, use_cache=True):
+        """Generate technical interview questions (for backward compatibility).
+
+        Pass ``use_cache=False`` to request a fresh question set instead of a
+        cached one for the same or a similar profile.
+        """
+        if not self.model:
+            return _FALLBACK_QUESTIONS_JSON
+
+        use_cache = use_cache and not _RESPONSE_CACHE_DISABLED
+        if use_cache:
+            cached_questions = self._question_cache.lookup(data)
+            if cached_questions is not None:
+                return _json_dumps(cached_questions)
+
+        prompt = self._create_question_generation_prompt(data)
+        
+        try:
+            response = self._make_api_request_with_retry(
+                prompt, use_cache=use_cache, generation_config=_QUESTION_SET_GENERATION_CONFIG
+            )
+            return self._questions_from_response(data, response)
+            
+        except Exception:
+            logger.exception("Error generating questions")
+            return _FALLBACK_QUESTIONS_JSON
+
+    async def agenerate_questions(self, data, use_cache=True):
+        """Async variant of generate_questions."""
+        if not self.model:
+            return _FALLBACK_QUESTIONS_JSON
+
+        use_cache = use_cache and not _RESPONSE_CACHE_DISABLED
+        if use_cache:
+            cached_questions = self._question_cache.lookup(data)
+            if cached_questions is not None:
+                return _json_dumps(cached_questions)
+
+        prompt = self._create_question_generation_prompt(data)
+
+        try:
+            response = await self._make_api_request_with_retry_async(
+                prompt, use_cache=use_cache, generation_config=_QUESTION_SET_GENERATION_CONFIG
+            )
+            return self._questions_from_response(data, response)
+
+        except Exception:
+            logger.exception("Error generating questions")
+            return _FALLBACK_QUESTIONS_JSON
+
+    def generate_questions_stream(self, data):
+        """
+        Stream the question generation response as it is produced.
+
+        Yields text chunks of the model's JSON output, e.g. for st.write_stream.
+        The complete response is cached once the stream ends, so a following
+        generate_questions(data) call returns the parsed questions immediately.
+        """
+        if not self.model:
+            yield _FALLBACK_QUESTIONS_JSON
+            return
+
+        use_cache = not _RESPONSE_CACHE_DISABLED
+        if use_cache:
+            cached_questions = self._question_cache.lookup(data)
+            if cached_questions is not None:
+                yield _json_dumps(cached_questions)
+                return
+
+        prompt = self._create_question_generation_prompt(data)
+        cache_key = self._cache_key(prompt)
+        if use_cache:
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                yield cached_response.text
+                return
+
+        chunks = []
+        try:
+            _request_bucket.acquire()
+            for chunk in self.model.generate_content(
+                prompt, generation_config=_QUESTION_SET_GENERATION_CONFIG, stream=True
+            ):
+                chunks.append(chunk.text)
+                yield chunk.text
+        except Exception:
+            logger.exception("Error streaming questions")
+            if not chunks:
+                yield _FALLBACK_QUESTIONS_JSON
+            return
+
+        response = _TextResponse("".join(chunks))
+        if use_cache and self._is_valid_question_set(self._extract_json_safe(response.text)):
+            self._store_response(cache_key, response)
+
+    def iter_questions_stream(self, data):
+        """
+        Yield questions one by one as they complete in the streamed response.
+
+        Each question is emitted as soon as its closing quote arrives, before the
+        rest of the JSON has been generated.
+
+        Yields:
+            tuple: (question_key, question_text), e.g. ("question1", "...")
+        """
+        buffer = ""
+        scan_from = 0
+        seen_keys = set()
+        for chunk in self.generate_questions_stream(data):
+            buffer += chunk
+            for match in _QUESTION_FIELD_RE.finditer(buffer, scan_from):
+                scan_from = match.end()
+                key = match.group(1)
+                if key in seen_keys:
+                    continue
+                seen_keys.add(key)
+                yield key, _json_loads(f'"{match.group(2)}"')
+
+    def _questions_from_response(self, data, response):
+        """Validate a question generation response and return the questions as a JSON string."""
+        json_text = self._json_object_text(response.text)
+        if json_text is not None:
+            try:
+                # Validate and re-serialize in one pass, without an intermediate dict
+                question_set = QuestionSet.model_validate_json(json_text)
+                self._question_cache.store(data, question_set.model_dump())
+                return question_set.model_dump_json()
+            except ValidationError as e:
+                logger.warning("Invalid question set: %d validation error(s)", e.error_count())
+
+        # If validation fails, return fallback
+        return _FALLBACK_QUESTIONS_JSON
+
+    def _is_valid_question_set(self, result):
+        """Check that a parsed response holds questions in the expected format."""
+        try:
+            QuestionSet.model_validate(result)
+            return True
+        except ValidationError:
+            return False
+
+    def _create_question_generation_prompt(self, data):
+        """Create a prompt for generating interview questions based on user data."""
+        return self._question_generation_prompt_cached(_format_data(data))
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _question_generation_prompt_cached(candidate_info):
+        """Build the question generation prompt for serialized candidate information."""
+        return _QUESTION_PROMPT_TMPL.format(candidate_info=candidate_info)
+
+    def generate_questions_bulk(self, data_list):
+        """
+        Generate interview questions for several candidates, packing up to
+        MAX_BULK_CANDIDATES candidates into each API call.
+
+        Args:
+            data_list (list): Candidate information for each candidate
+
+        Returns:
+            list: JSON strings of questions, in the same order as data_list
+        """
+        results, pending = self._lookup_cached_question_sets(data_list)
+        for batch in self._bulk_batches(pending):
+            batch_data = [data_list[i] for i in batch]
+            for i, questions in zip(batch, self._generate_questions_batch(batch_data)):
+                results[i] = questions
+        return results
+
+    async def agenerate_questions_bulk(self, data_list):
+        """Async variant of generate_questions_bulk that sends all batches concurrently."""
+        results, pending = self._lookup_cached_question_sets(data_list)
+        batches = self._bulk_batches(pending)
+        batch_results = await asyncio.gather(*[
+            self._agenerate_questions_batch([data_list[i] for i in batch]) for batch in batches
+        ])
+        for batch, questions_list in zip(batches, batch_results):
+            for i, questions in zip(batch, questions_list):
+                results[i] = questions
+        return results
+
+    def _lookup_cached_question_sets(self, data_list):
+        """Resolve candidates from the question cache, returning results and indices still to generate."""
+        results = [None] * len(data_list)
+        pending = []
+        for i, data in enumerate(data_list):
+            cached_questions = self._question_cache.lookup(data) if self.model else None
+            if cached_questions is not None:
+                results[i] = _json_dumps(cached_questions)
+            else:
+                pending.append(i)
+        return results, pending
+
+    def _bulk_batches(self, items):
+        """Split items into batches of at most MAX_BULK_CANDIDATES."""
+        size = self.MAX_BULK_CANDIDATES
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def _generate_questions_batch(self, batch):
+        """Generate questions for one batch, degrading to per-candidate calls on failure."""
+        if not self.model or len(batch) == 1:
+            return [self.generate_questions(data) for data in batch]
+
+        try:
+            response = self._make_api_request_with_retry(self._create_bulk_question_generation_prompt(batch))
+            results = self._split_bulk_questions(batch, response)
+        except Exception:
+            logger.exception("Error generating bulk questions")
+            results = [None] * len(batch)
+
+        return [
+            questions if questions is not None else self.generate_questions(data)
+            for data, questions in zip(batch, results)
+        ]
+
+    async def _agenerate_questions_batch(self, batch):
+        """Async variant of _generate_questions_batch."""
+        if not self.model or len(batch) == 1:
+            return list(await asyncio.gather(*[self.agenerate_questions(data) for data in batch]))
+
+        try:
+            response = await self._make_api_request_with_retry_async(
+                self._create_bulk_question_generation_prompt(batch)
+            )
+            results = self._split_bulk_questions(batch, response)
+        except Exception:
+            logger.exception("Error generating bulk questions")
+            results = [None] * len(batch)
+
+        retried = await asyncio.gather(*[
+            self.agenerate_questions(data) for data, questions in zip(batch, results) if questions is None
+        ])
+        retried = iter(retried)
+        return [questions if questions is not None else next(retried) for questions in results]
+
+    def _split_bulk_questions(self, batch, response):
+        """Split a bulk response into per-candidate JSON strings, with None for missing candidates."""
+        result = self._extract_json_safe(response.text)
+        if not isinstance(result, dict) or result.get("error"):
+            return [None] * len(batch)
+
+        questions_list = []
+        for i, data in enumerate(batch, 1):
+            try:
+                question_set = QuestionSet.model_validate(result.get(f"candidate{i}"))
+            except ValidationError:
+                questions_list.append(None)
+                continue
+            self._question_cache.store(data, question_set.model_dump())
+            questions_list.append(question_set.model_dump_json())
+        return questions_list
+
+    def _create_bulk_question_generation_prompt(self, batch):
+        """Create a prompt that generates interview questions for several candidates at once."""
+        candidates_text = "\n".join(
+            f"---CANDIDATE {i}---\n{_format_data(data)}"
+            for i, data in enumerate(batch, 1)
+        )
+
+        return _BULK_QUESTION_PROMPT_TMPL.format(count=len(batch), candidates_text=candidates_text)
+
+    def _get_fallback_questions(self):
+        """Provide default questions when API fails."""
+        return dict(_FALLBACK_QUESTIONS)
+
+    def evaluate_candidate_agent(self, data):
+        """Evaluate the candidate's responses (for backward compatibility)."""
+        if not self.model:
+            return self._get_fallback_legacy_evaluation()
+
+        prompt = self._create_legacy_evaluation_prompt(data)
+        return self._run_and_parse(prompt, self._get_fallback_legacy_evaluation)
+
+    async def aevaluate_candidate_agent(self, data):
+        """Async variant of evaluate_candidate_agent."""
+        if not self.model:
+            return self._get_fallback_legacy_evaluation()
+
+        prompt = self._create_legacy_evaluation_prompt(data)
+        return await self._arun_and_parse(prompt, self._get_fallback_legacy_evaluation)
+
+    def _create_legacy_evaluation_prompt(self, data):
+        """Create evaluation prompt for legacy compatibility."""
+        return self._legacy_evaluation_prompt_cached(_format_data(data))
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _legacy_evaluation_prompt_cached(interview_data):
+        """Build the legacy evaluation prompt for serialized interview data."""
+        return _LEGACY_PROMPT_TMPL.format(interview_data=interview_data)
+
+    def _get_fallback_legacy_evaluation(self):
+        """Provide default evaluation for legacy compatibility."""
+        return _json_loads(_FALLBACK_LEGACY_EVALUATION_JSON)
+
+    def _json_object_text(self, response_text):
+        """Return the outermost JSON object in a response, without markdown fences, or None."""
+        text = _FENCE_RE.sub('', response_text)
+        start_idx = text.find("{")
+        end_idx = text.rfind("}")
+        if start_idx < 0 or end_idx < start_idx:
+            return None
+        return text[start_idx:end_idx + 1]
+
+    def _extract_json_safe(self, response_text):
+        """Safely extract JSON content from the model's response."""
+        # Fast path: the response is already bare JSON, as requested by the prompts
+        if response_text.lstrip().startswith("{"):
+            try:
+                return _json_loads(response_text)
+            except ValueError:
+                pass
+
+        try:
+            json_text = self._json_object_text(response_text)
+            if json_text is None:
+                logger.warning("JSON parsing error: no JSON object in response")
+                logger.debug("Raw response: %s", response_text)
+                return {"error": "Invalid JSON response from API"}
+
+            return _json_loads(json_text)
             
         except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-            print(f"Raw response: {response_text}")
+            logger.warning("JSON parsing error: %s", e)
+            logger.debug("Raw response: %s", response_text)
             return {"error": "Invalid JSON response from API"}
-        except Exception as e:
-            print(f"Unexpected error in JSON extraction: {e}")
+        except Exception:
+            logger.exception("Unexpected error in JSON extraction")
             return {"error": "Failed to process API response"}
-
-
-# Example usage
-if __name__ == "__main__":
-    evaluator = AnswerEvaluationAgent()
-    
-    # Example 1: Evaluate a single answer
-    question = "What is your experience with Python?"
-    answer = """I have been working with Python for about 3 years. I've used it for web development 
-    with Django and Flask, data analysis with pandas and numpy, and automation scripts. 
-    I'm comfortable with object-oriented programming and have experience with testing frameworks like pytest."""
-    
-    result = evaluator.evaluate_single_answer(question, answer, "Software Developer position")
-    print("Single Answer Evaluation:")
-    print(json.dumps(result, indent=2))
-    
-    # Example 2: Evaluate multiple answers
-    qa_pairs = [
-        {
-            "question": "What is your experience with Python?",
-            "answer": "I have 3 years of experience with Python, working on web development and data analysis."
-        },
-        {
-            "question": "How do you handle debugging?",
-            "answer": "I use debuggers, print statements, and logging to identify and fix issues systematically."
-        }
-    ]
-    
-    comprehensive_result = evaluator.evaluate_multiple_answers(qa_pairs, "Python Developer Interview")
-    print("\nComprehensive Evaluation:")
-    print(json.dumps(comprehensive_result, indent=2))
\ No newline at end of file
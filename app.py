@@ -1,15 +1,23 @@
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import json
 from dotenv import load_dotenv
 import google.generativeai as gen_ai
 # from Agents.agent import Agents
-from Agents.agent import AnswerEvaluationAgent
+from interview_ui import QUESTIONS, get_agents, initialize_session_state, reset_and_rerun, translate_role_for_streamlit
+from utils.semcache import SLOT_FIELDS
 
 
+# Background workers that evaluate answers while the candidate moves on
+@st.cache_resource
+def get_evaluation_executor():
+    return ThreadPoolExecutor(max_workers=4)
+
 # Initialize Agents with error handling
 try:
-    agents = AnswerEvaluationAgent()
+    agents = get_agents()
 except Exception as e:
     st.error(f"Failed to initialize AI agents: {str(e)}")
     st.stop()
@@ -22,42 +30,24 @@ st.set_page_config(
 )
 
 # Initialize Session State
-def initialize_session_state():
-    state_defaults = {
-        "chat_session": None,
+def initialize_app_session_state():
+    initialize_session_state({
+        "chat_history": [],
         "chat_stage": 0,
         "user_data": {},
         "questions": {},
+        "question_list": (),
         "evaluation_data": {},
-        "user_response": {},
         "evaluation_prompt": "",
         "api_error": False,
         "error_message": "",
         "question_index": 0,
         "show_detailed_evaluation": False,
-        "individual_evaluations": {}
-    }
-    for key, value in state_defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
-    
-    # Initialize chat session safely
-    if st.session_state.chat_session is None and agents.model:
-        try:
-            st.session_state.chat_session = agents.model.start_chat(history=[])
-        except Exception as e:
-            st.session_state.api_error = True
-            st.session_state.error_message = f"Chat initialization failed: {str(e)}"
+        "individual_evaluations": {},
+        "pending_evals": {}
+    })
 
-initialize_session_state()
-
-# Helper Functions
-def translate_role_for_streamlit(user_role):
-    return "assistant" if user_role == "model" else user_role
-
-def reset_and_rerun():
-    st.session_state.clear()
-    st.rerun()
+initialize_app_session_state()
 
 # UI Setup
 st.title("🎯 Talent Scout")
@@ -90,29 +80,28 @@ with col3:
             st.session_state.show_detailed_evaluation = True
             st.rerun()
 
-# Display Chat History (only if chat session exists)
-if st.session_state.chat_session and hasattr(st.session_state.chat_session, 'history'):
-    for message in st.session_state.chat_session.history:
-        with st.chat_message(translate_role_for_streamlit(message.get("role", "user"))):
-            parts = message.get("parts", [])
-            if parts and len(parts) > 0:
-                st.markdown(parts[0].get("text", ""))
-
-# Define Static Questions
-questions = [
-    ("Full Name", "What is your full name?"),
-    ("Email", "What is your email address?"),
-    ("Phone Number", "What is your phone number?"),
-    ("Years of Experience", "How many years of experience do you have?"),
-    ("Desired Position", "What is your desired position?"),
-    ("Current Location", "Where are you currently located?"),
-    ("Tech Stack", "What is your tech stack (e.g., Python, Django, SQL)?"),
-]
+# Display Chat History, kept as (role, text) pairs using the Gemini role names
+for role, text in st.session_state.chat_history:
+    with st.chat_message(translate_role_for_streamlit(role)):
+        st.markdown(text)
+
+# Profile questions plus the five generated technical questions
+TOTAL_QUESTIONS = len(QUESTIONS) + 5
+
+# Chat history entries kept in session state (two per answered question)
+MAX_CHAT_HISTORY = 40
+
+def record_turn(question, answer):
+    history = st.session_state.chat_history
+    history.append(("model", question))
+    history.append(("user", answer))
+    if len(history) > MAX_CHAT_HISTORY:
+        del history[:-MAX_CHAT_HISTORY]
 
 # Question-Answer Flow
 def ask_questions():
-    if st.session_state.chat_stage < len(questions):
-        key, question = questions[st.session_state.chat_stage]
+    if st.session_state.chat_stage < len(QUESTIONS):
+        key, question = QUESTIONS[st.session_state.chat_stage]
 
         # Display Assistant's Question
         with st.chat_message("assistant"):
@@ -124,27 +113,68 @@ def ask_questions():
             # Save response and update chat history safely
             st.session_state.user_data[key] = user_input
             
-            # Update chat history if session exists
-            if st.session_state.chat_session:
-                try:
-                    st.session_state.chat_session.history.extend([
-                        {"role": "model", "parts": [{"text": question}]},
-                        {"role": "user", "parts": [{"text": user_input}]},
-                    ])
-                except Exception as e:
-                    print(f"Chat history update failed: {e}")
+            record_turn(question, user_input)
             
             st.session_state.chat_stage += 1
             st.rerun()
     else:
         handle_dynamic_questions()
 
+def question_profile(user_data):
+    # Only these fields shape the questions; leaving out name and contact details
+    # gives candidates with the same profile the same prompt, which the agent's
+    # persistent response cache then answers for 24 hours
+    return {field: user_data.get(field, "") for field in SLOT_FIELDS}
+
+def collect_pending_evaluation(question, timeout=None):
+    # Move a finished background evaluation into individual_evaluations;
+    # with a timeout, wait for it instead of only checking
+    future = st.session_state.pending_evals.get(question)
+    if future is None or (timeout is None and not future.done()):
+        return st.session_state.individual_evaluations.get(question)
+    del st.session_state.pending_evals[question]
+    st.session_state.individual_evaluations[question] = future.result(timeout=timeout)
+    return st.session_state.individual_evaluations[question]
+
+def show_instant_feedback(question_index, question):
+    # Get individual answer evaluation for the previous answer
+    if st.button(f"📝 Get instant feedback for your last answer", key=f"eval_{question_index}"):
+        with st.spinner("Evaluating your answer..."):
+            try:
+                individual_eval = collect_pending_evaluation(question, timeout=5)
+                if individual_eval is None:
+                    context = f"{st.session_state.user_data.get('Desired Position', 'General')} position"
+                    individual_eval = agents.evaluate_single_answer(question, st.session_state.evaluation_data[question], context)
+                    st.session_state.individual_evaluations[question] = individual_eval
+                
+                # Show quick feedback
+                with st.expander("📊 Instant Feedback", expanded=True):
+                    if isinstance(individual_eval, dict) and "overall_score" in individual_eval:
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.metric("Score", f"{individual_eval['overall_score']}/100")
+                        with col2:
+                            st.write(f"**Impression:** {individual_eval.get('overall_impression', 'Good')}")
+                        
+                        if "strengths" in individual_eval:
+                            st.write("**Strengths:**")
+                            for strength in individual_eval["strengths"][:2]:  # Show top 2
+                                st.write(f"✅ {strength}")
+                        
+                        if "improvement_suggestions" in individual_eval:
+                            st.write("**Quick Tips:**")
+                            for tip in individual_eval["improvement_suggestions"][:2]:  # Show top 2
+                                st.write(f"💡 {tip}")
+            except Exception as e:
+                st.error("Unable to provide instant feedback right now.")
+                print(f"Individual evaluation error: {e}")
+
 def handle_dynamic_questions():
     # Generate questions if not already done
     if not st.session_state.questions:
         with st.spinner("🤖 Generating personalized questions..."):
             try:
-                generated_questions_json = agents.generate_questions(st.session_state.user_data)
+                generated_questions_json = agents.generate_questions(question_profile(st.session_state.user_data))
                 
                 # Handle both string and dict responses
                 if isinstance(generated_questions_json, str):
@@ -170,13 +200,17 @@ def handle_dynamic_questions():
                     "question5": "What are your career goals for the next 2-3 years?"
                 }
 
+        st.session_state.question_list = tuple(st.session_state.questions.items())
+
     # Ask Additional Questions
-    question_keys = list(st.session_state.questions.keys())
-    question_index = st.session_state.get("question_index", 0)
+    question_list = st.session_state.question_list
+    question_index = st.session_state.question_index
+
+    if question_index < len(question_list):
+        key, question = question_list[question_index]
 
-    if question_index < len(question_keys):
-        key = question_keys[question_index]
-        question = st.session_state.questions[key]
+        if question_index > 0:
+            show_instant_feedback(question_index - 1, question_list[question_index - 1][1])
 
         with st.chat_message("assistant"):
             st.markdown(f"**Technical Question {question_index + 1}/5:** {question}")
@@ -184,47 +218,15 @@ def handle_dynamic_questions():
         user_input = st.chat_input("Your detailed response")
         if user_input:
             # Save response and update chat history
-            st.session_state.user_response[question] = user_input
             st.session_state.evaluation_data[question] = user_input
             
-            # Get individual answer evaluation (new feature)
-            if st.button(f"📝 Get instant feedback for this answer", key=f"eval_{question_index}"):
-                with st.spinner("Evaluating your answer..."):
-                    try:
-                        context = f"{st.session_state.user_data.get('Desired Position', 'General')} position"
-                        individual_eval = agents.evaluate_single_answer(question, user_input, context)
-                        st.session_state.individual_evaluations[question] = individual_eval
-                        
-                        # Show quick feedback
-                        with st.expander("📊 Instant Feedback", expanded=True):
-                            if isinstance(individual_eval, dict) and "overall_score" in individual_eval:
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.metric("Score", f"{individual_eval['overall_score']}/100")
-                                with col2:
-                                    st.write(f"**Impression:** {individual_eval.get('overall_impression', 'Good')}")
-                                
-                                if "strengths" in individual_eval:
-                                    st.write("**Strengths:**")
-                                    for strength in individual_eval["strengths"][:2]:  # Show top 2
-                                        st.write(f"✅ {strength}")
-                                
-                                if "improvement_suggestions" in individual_eval:
-                                    st.write("**Quick Tips:**")
-                                    for tip in individual_eval["improvement_suggestions"][:2]:  # Show top 2
-                                        st.write(f"💡 {tip}")
-                    except Exception as e:
-                        st.error("Unable to provide instant feedback right now.")
-                        print(f"Individual evaluation error: {e}")
+            # Start evaluating the answer in the background so instant feedback is ready when asked for
+            context = f"{st.session_state.user_data.get('Desired Position', 'General')} position"
+            st.session_state.pending_evals[question] = get_evaluation_executor().submit(
+                agents.evaluate_single_answer, question, user_input, context
+            )
             
-            if st.session_state.chat_session:
-                try:
-                    st.session_state.chat_session.history.extend([
-                        {"role": "model", "parts": [{"text": question}]},
-                        {"role": "user", "parts": [{"text": user_input}]},
-                    ])
-                except Exception as e:
-                    print(f"Chat history update failed: {e}")
+            record_turn(question, user_input)
             
             st.session_state.question_index = question_index + 1
             st.rerun()
@@ -239,9 +241,19 @@ def finalize_evaluation():
             for question, answer in st.session_state.evaluation_data.items():
                 qa_pairs.append({"question": question, "answer": answer})
             
-            # Get comprehensive evaluation using the new method
+            # Stream the comprehensive evaluation so feedback shows up as it is generated
             context = f"{st.session_state.user_data.get('Desired Position', 'General')} position at {st.session_state.user_data.get('Current Location', 'Various')} location"
-            comprehensive_score = agents.evaluate_multiple_answers(qa_pairs, context)
+            placeholder = st.empty()
+            buf = []
+            for chunk in agents.evaluate_multiple_answers_stream(qa_pairs, context):
+                buf.append(chunk)
+                placeholder.code("".join(buf), language="json")
+            placeholder.empty()
+            comprehensive_score = agents.parse_session_evaluation("".join(buf))
+            
+            # Fall back to the blocking call if the stream did not produce a usable result
+            if comprehensive_score is None:
+                comprehensive_score = agents.evaluate_multiple_answers(qa_pairs, context)
             
             # Fallback to legacy evaluation if new method fails
             if not comprehensive_score or comprehensive_score.get("error"):
@@ -336,6 +348,20 @@ def finalize_evaluation():
             st.markdown("**Thank you for your time! Our recruiter will contact you soon.** 📞")
             print("Evaluation Error:", e)
 
+# Upper bound on answers analyzed at once by "Analyze All Answers"
+ANALYZE_ALL_CONCURRENCY = 5
+
+async def evaluate_answers_concurrently(qa_items, context):
+    """Evaluate (question, answer) pairs concurrently, returning {question: evaluation}."""
+    semaphore = asyncio.Semaphore(ANALYZE_ALL_CONCURRENCY)
+
+    async def evaluate(question, answer):
+        async with semaphore:
+            return await agents.aevaluate_single_answer(question, answer, context)
+
+    results = await asyncio.gather(*[evaluate(question, answer) for question, answer in qa_items])
+    return {question: result for (question, _), result in zip(qa_items, results)}
+
 # Show detailed evaluation page
 def show_detailed_evaluation_page():
     st.markdown("## 🔍 Detailed Answer Analysis")
@@ -344,6 +370,25 @@ def show_detailed_evaluation_page():
         st.warning("No answers to analyze yet. Complete the interview first.")
         return
     
+    for question in list(st.session_state.pending_evals):
+        collect_pending_evaluation(question)
+    
+    pending_answers = [
+        (question, answer)
+        for question, answer in st.session_state.evaluation_data.items()
+        if question not in st.session_state.individual_evaluations
+    ]
+    if pending_answers and st.button("⚡ Analyze All Answers"):
+        with st.spinner(f"Analyzing {len(pending_answers)} answers..."):
+            try:
+                context = f"{st.session_state.user_data.get('Desired Position', 'General')} position"
+                st.session_state.individual_evaluations.update(
+                    asyncio.run(evaluate_answers_concurrently(pending_answers, context))
+                )
+                st.rerun()
+            except Exception as e:
+                st.error(f"Analysis failed: {str(e)}")
+    
     # Analyze each answer individually
     for i, (question, answer) in enumerate(st.session_state.evaluation_data.items(), 1):
         with st.expander(f"Question {i}: Analysis", expanded=False):
@@ -397,12 +442,11 @@ if st.session_state.show_detailed_evaluation:
 else:
     # Progress indicator
     if st.session_state.chat_stage > 0:
-        total_questions = len(questions) + 5  # 7 basic + 5 technical
-        current_progress = st.session_state.chat_stage + st.session_state.get("question_index", 0)
-        progress = min(current_progress / total_questions, 1.0)
+        current_progress = st.session_state.chat_stage + st.session_state.question_index
+        progress = min(current_progress / TOTAL_QUESTIONS, 1.0)
         
         st.progress(progress)
-        st.write(f"Progress: {current_progress}/{total_questions} questions completed")
+        st.write(f"Progress: {current_progress}/{TOTAL_QUESTIONS} questions completed")
 
     # Start the Question Flow
     ask_questions()
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Example usage of AnswerEvaluationAgent.
+
+Run from the repository root: python -m examples.agent_demo
+"""
+import json
+
+from Agents.agent import AnswerEvaluationAgent
+
+
+if __name__ == "__main__":
+    evaluator = AnswerEvaluationAgent()
+    
+    # Example 1: Evaluate a single answer
+    question = "What is your experience with Python?"
+    answer = """I have been working with Python for about 3 years. I've used it for web development 
+    with Django and Flask, data analysis with pandas and numpy, and automation scripts. 
+    I'm comfortable with object-oriented programming and have experience with testing frameworks like pytest."""
+    
+    result = evaluator.evaluate_single_answer(question, answer, "Software Developer position")
+    print("Single Answer Evaluation:")
+    print(json.dumps(result, indent=2))
+    
+    # Example 2: Evaluate multiple answers
+    qa_pairs = [
+        {
+            "question": "What is your experience with Python?",
+            "answer": "I have 3 years of experience with Python, working on web development and data analysis."
+        },
+        {
+            "question": "How do you handle debugging?",
+            "answer": "I use debuggers, print statements, and logging to identify and fix issues systematically."
+        }
+    ]
+    
+    comprehensive_result = evaluator.evaluate_multiple_answers(qa_pairs, "Python Developer Interview")
+    print("\nComprehensive Evaluation:")
+    print(json.dumps(comprehensive_result, indent=2))
@@ -0,0 +1,40 @@
+import streamlit as st
+
+from Agents.agent import AnswerEvaluationAgent
+
+
+# Candidate profile questions asked before the technical interview
+QUESTIONS = (
+    ("Full Name", "What is your full name?"),
+    ("Email", "What is your email address?"),
+    ("Phone Number", "What is your phone number?"),
+    ("Years of Experience", "How many years of experience do you have?"),
+    ("Desired Position", "What is your desired position?"),
+    ("Current Location", "Where are you currently located?"),
+    ("Tech Stack", "What is your tech stack (e.g., Python, Django, SQL)?"),
+)
+
+
+# No spinner: the first call comes before st.set_page_config, which must be the first Streamlit command
+@st.cache_resource(show_spinner=False)
+def get_agents():
+    """Create the evaluation agent once per process and share it across reruns and sessions."""
+    return AnswerEvaluationAgent()
+
+
+def initialize_session_state(state_defaults):
+    """Set every missing session state key to its default value."""
+    for key, value in state_defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+
+def translate_role_for_streamlit(user_role):
+    """Map a Gemini chat role to the matching st.chat_message role."""
+    return "assistant" if user_role == "model" else user_role
+
+
+def reset_and_rerun():
+    """Forget the whole session and start the app over."""
+    st.session_state.clear()
+    st.rerun()
@@ -1,18 +1,52 @@
 import google.generativeai as gen_ai
+import json
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 API_KEY = os.getenv('GOOGLE_API_KEY')
 
-if not API_KEY:
-    print("Error: GOOGLE_API_KEY not found in environment variables")
-else:
-    gen_ai.configure(api_key=API_KEY)
+# The model list is kept on disk for a day so repeated runs skip the API call
+MODELS_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ai_coach", "models.json")
+MODELS_CACHE_TTL = 24 * 60 * 60
+
+
+def load_cached_models():
+    try:
+        if time.time() - os.path.getmtime(MODELS_CACHE_PATH) < MODELS_CACHE_TTL:
+            with open(MODELS_CACHE_PATH) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def fetch_models():
+    models = [
+        {"name": model.name, "methods": list(model.supported_generation_methods)}
+        for model in gen_ai.list_models()
+    ]
     try:
-        models = gen_ai.list_models()
-        for model in models:
-            print(f"Model Name: {model.name}, Supported Methods: {model.supported_generation_methods}")
-    except Exception as e:
-        print("Error accessing Gemini API:", e)
+        os.makedirs(os.path.dirname(MODELS_CACHE_PATH), exist_ok=True)
+        with open(MODELS_CACHE_PATH, "w") as f:
+            json.dump(models, f)
+    except OSError as e:
+        print("Could not cache model list:", e)
+    return models
+
+
+models = load_cached_models()
+if models is None:
+    if not API_KEY:
+        print("Error: GOOGLE_API_KEY not found in environment variables")
+    else:
+        gen_ai.configure(api_key=API_KEY)
+        try:
+            models = fetch_models()
+        except Exception as e:
+            print("Error accessing Gemini API:", e)
+
+for model in models or []:
+    print(f"Model Name: {model['name']}, Supported Methods: {model['methods']}")
@@ -3,13 +3,17 @@ import streamlit as st
 import json
 from dotenv import load_dotenv
 import google.generativeai as gen_ai
-from Agents.agent import Agents
+from interview_ui import get_agents, initialize_session_state, reset_and_rerun
 import PyPDF2
 from docx import Document
 import io
 
-# Initialize Agents
-agents = Agents()
+# Initialize Agents with error handling
+try:
+    agents = get_agents()
+except Exception as e:
+    st.error(f"Failed to initialize AI agents: {str(e)}")
+    st.stop()
 
 # Streamlit Page Configuration
 st.set_page_config(
@@ -66,33 +70,23 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # Initialize Session State
-def initialize_session_state():
-    state_defaults = {
-        "chat_session": agents.model.start_chat(history=[]),
-        "user_data": {},
-        "evaluation_data": {},
-        "resume_text": "",
-        "resume_analysis": None,
-        "position_selected": False,
-        "technical_questions": None,
-        "current_question_index": 0,
-        "answers": {},
-        "evaluation_complete": False
-    }
-    for key, value in state_defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
-
-initialize_session_state()
+initialize_session_state({
+    "user_data": {},
+    "evaluation_data": {},
+    "resume_text": "",
+    "resume_analysis": None,
+    "position_selected": False,
+    "technical_questions": None,
+    "current_question_index": 0,
+    "answers": {},
+    "evaluation_complete": False
+})
 
 # [File Processing Functions remain the same]
 def extract_text_from_pdf(pdf_file):
     try:
         pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
     except Exception as e:
         st.error(f"Error reading PDF: {str(e)}")
         return ""
@@ -101,10 +95,7 @@ def extract_text_from_docx(docx_file):
     try:
         docx_bytes = io.BytesIO(docx_file.read())
         doc = Document(docx_bytes)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
     except Exception as e:
         st.error(f"Error reading DOCX: {str(e)}")
         return ""
@@ -525,8 +516,7 @@ def main():
         display_technical_assessment()
     
     if st.button("Reset Application"):
-        st.session_state.clear()
-        st.rerun()
+        reset_and_rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
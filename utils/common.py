@@ -7,7 +7,6 @@ You are a hiring manager responsible for assessing candidates based on their tec
 2. The first question should always assess fundamental knowledge of the tech stack.  
 3. Gradually increase the difficulty of the questions based on the complexity of concepts.  
 4. Provide the response strictly in JSON format without any preamble, markdown, or additional text.
-{data}
 
 The response structure must be:  
 {{
@@ -20,6 +19,8 @@ The response structure must be:
   "question5": "<Fifth question with the highest level of difficulty>"  
 }}
 
+User's specified tech stack:
+{data}
 """
     return prompt
 
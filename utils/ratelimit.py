@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Client-side token bucket that paces requests below a provider's rate limit.
+
+    Each request takes one token; tokens refill continuously at ``rate`` per second
+    up to ``capacity``. A caller that finds the bucket empty reserves the next token
+    and waits locally instead of being rejected by the server.
+    """
+    def __init__(self, rate, capacity):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum number of tokens, i.e. the allowed burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def drain(self):
+        """Empty the bucket, e.g. after the server reports a rate limit, so all callers slow down."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(0, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+
+    def acquire(self):
+        """Block until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Wait without blocking the event loop until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,106 @@
+import math
+import re
+import threading
+from collections import OrderedDict
+
+
+# Candidate profile fields that actually shape the generated questions
+SLOT_FIELDS = ("Tech Stack", "Desired Position", "Years of Experience")
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+class SemanticQuestionCache:
+    """
+    Serve previously generated question sets for structurally similar candidate profiles.
+
+    Profiles are reduced to their slot fields, tokenized, and compared with a cosine
+    similarity over token sets. On a hit, slot values from the cached profile that appear
+    in the cached questions are substituted with the new candidate's values.
+    """
+    def __init__(self, threshold=0.92, maxsize=256):
+        """Initialize an empty cache with a similarity threshold and entry limit."""
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _slots(self, data):
+        """Extract the slot values from candidate data, or None if it has none."""
+        if not isinstance(data, dict):
+            return None
+        slots = {field: str(data[field]).strip() for field in SLOT_FIELDS if data.get(field)}
+        return slots or None
+
+    def _signature(self, slots):
+        """Build a token set for the slots, keeping tokens from different fields apart."""
+        return frozenset(
+            f"{field}:{token}"
+            for field, value in slots.items()
+            for token in _TOKEN_RE.findall(value.lower())
+        )
+
+    def _similarity(self, sig_a, sig_b):
+        """Cosine similarity between two token sets."""
+        if not sig_a or not sig_b:
+            return 0.0
+        return len(sig_a & sig_b) / math.sqrt(len(sig_a) * len(sig_b))
+
+    def _substitute(self, questions, old_slots, new_slots):
+        """Replace the cached candidate's slot values with the new candidate's values."""
+        replacements = [
+            (re.compile(re.escape(old_value), re.IGNORECASE), new_slots[field])
+            for field, old_value in old_slots.items()
+            if field in new_slots and new_slots[field] != old_value
+        ]
+        if not replacements:
+            return dict(questions)
+
+        result = {}
+        for key, question in questions.items():
+            for pattern, new_value in replacements:
+                question = pattern.sub(lambda _: new_value, question)
+            result[key] = question
+        return result
+
+    def lookup(self, data):
+        """
+        Find cached questions for a profile similar to the given candidate data.
+
+        Args:
+            data (dict): Candidate information
+
+        Returns:
+            dict: Question set adapted to the candidate, or None on a miss
+        """
+        slots = self._slots(data)
+        if slots is None:
+            return None
+        signature = self._signature(slots)
+
+        with self._lock:
+            best_sig, best_score = None, 0.0
+            for cached_sig in self._entries:
+                score = self._similarity(signature, cached_sig)
+                if score > best_score:
+                    best_sig, best_score = cached_sig, score
+
+            if best_sig is None or best_score < self.threshold:
+                return None
+            self._entries.move_to_end(best_sig)
+            cached_slots, questions = self._entries[best_sig]
+
+        return self._substitute(questions, cached_slots, slots)
+
+    def store(self, data, questions):
+        """Remember the question set generated for the given candidate data."""
+        slots = self._slots(data)
+        if slots is None:
+            return
+        signature = self._signature(slots)
+
+        with self._lock:
+            self._entries[signature] = (slots, dict(questions))
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class SQLiteCache:
+    """
+    Persistent key-value cache stored in a single SQLite file.
+
+    Entries expire after a per-entry TTL, and the least recently used entries are
+    evicted once the stored values exceed ``size_limit`` bytes. The file can be
+    shared by several processes.
+    """
+    def __init__(self, path, size_limit=500_000_000):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path (str): Location of the SQLite database
+            size_limit (int): Maximum total size of stored values in bytes
+        """
+        self.path = os.path.expanduser(path)
+        self.size_limit = size_limit
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires REAL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def get(self, key):
+        """Return the cached value for a key, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, expires = row
+            if expires is not None and expires < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key, value, expire=None):
+        """
+        Store a value, evicting least recently used entries beyond the size limit.
+
+        Args:
+            key (str): Cache key
+            value (str): Value to store
+            expire (float): Seconds until the entry expires, or None to keep it
+        """
+        now = time.time()
+        expires = now + expire if expire is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), expires, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under the size limit."""
+        self._conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total_size <= self.size_limit:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed").fetchall()
+        stale_keys = []
+        for key, size in rows:
+            if total_size <= self.size_limit:
+                break
+            stale_keys.append((key,))
+            total_size -= size
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", stale_keys)